@@ -1,10 +1,41 @@
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, date
 import json
+import os
+import threading
 from .models import *
 
+TABLES = (
+    "users",
+    "user_profiles",
+    "next_of_kin",
+    "medical_info",
+    "certificates",
+    "electronic_signatures",
+    "vessels",
+    "crew_assignments",
+    "maintenance_records",
+    "safety_records",
+    "qhse_records",
+)
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _decode_object(obj: dict):
+    if len(obj) == 1:
+        if "$datetime" in obj:
+            return datetime.fromisoformat(obj["$datetime"])
+        if "$date" in obj:
+            return date.fromisoformat(obj["$date"])
+    return obj
+
 class InMemoryDatabase:
-    def __init__(self):
+    def __init__(self, seed: bool = True):
         self.users: Dict[int, dict] = {}
         self.user_profiles: Dict[int, dict] = {}
         self.next_of_kin: Dict[int, dict] = {}
@@ -19,7 +50,8 @@ class InMemoryDatabase:
         
         self._next_id = 1
         
-        self._seed_data()
+        if seed:
+            self._seed_data()
     
     def _get_next_id(self) -> int:
         current_id = self._next_id
@@ -58,6 +90,23 @@ class InMemoryDatabase:
         }
         self.maintenance_records[demo_maintenance["id"]] = demo_maintenance
     
+    def load_snapshot(self, path: str):
+        """Replace all tables with the contents of a snapshot written by dump_snapshot."""
+        with open(path) as f:
+            snapshot = json.load(f, object_hook=_decode_object)
+        tables = snapshot["tables"]
+        for table in TABLES:
+            setattr(self, table, {int(key): row for key, row in tables.get(table, {}).items()})
+        self._next_id = snapshot["next_id"]
+    
+    def dump_snapshot(self, path: str):
+        snapshot = {
+            "next_id": self._next_id,
+            "tables": {table: getattr(self, table) for table in TABLES},
+        }
+        with open(path, "w") as f:
+            json.dump(snapshot, f, default=_encode_value)
+    
     def create_user(self, user_data: dict) -> dict:
         user_id = self._get_next_id()
         user_data["id"] = user_id
@@ -209,4 +258,32 @@ class InMemoryDatabase:
             self.electronic_signatures[signature_id] = signature_data
             return signature_data
 
-db = InMemoryDatabase()
+_db: Optional[InMemoryDatabase] = None
+_db_snapshot_path: Optional[str] = None
+_db_lock = threading.Lock()
+
+def init_db(snapshot_path: Optional[str] = None) -> InMemoryDatabase:
+    """Build the database on first use, from a snapshot file if one is configured."""
+    global _db, _db_snapshot_path
+    if _db is not None and not snapshot_path:
+        return _db
+    with _db_lock:
+        if _db is None:
+            _db_snapshot_path = snapshot_path or os.getenv("SEED_SNAPSHOT_PATH") or None
+            database = InMemoryDatabase(seed=not _db_snapshot_path)
+            if _db_snapshot_path:
+                database.load_snapshot(_db_snapshot_path)
+            _db = database
+        elif snapshot_path and snapshot_path != _db_snapshot_path:
+            raise RuntimeError(
+                f"Database already initialized from {_db_snapshot_path or 'demo seed'}; "
+                f"cannot load {snapshot_path}"
+            )
+        return _db
+
+class _LazyDatabase:
+    """Forwards to the database so importing this module does not build or seed it."""
+    def __getattr__(self, name):
+        return getattr(init_db(), name)
+
+db = _LazyDatabase()
@@ -1,9 +1,10 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from datetime import timedelta
 from typing import List, Optional
 from .models import *
-from .database import db
+from .database import db, init_db
 from .auth import (
     authenticate_user, 
     create_access_token, 
@@ -13,8 +14,25 @@ from .auth import (
     require_admin,
     require_admin_or_manager
 )
+from .ratelimit import (
+    concurrency_middleware,
+    enforce_login_attempt,
+    metrics_snapshot,
+    rate_limit,
+    record_login_failure,
+    rate_limit_user
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build and seed the database at startup rather than at import time.
+    init_db()
+    yield
 
-app = FastAPI(title="Vessel Management System API", version="1.0.0")
+app = FastAPI(title="Vessel Management System API", version="1.0.0", lifespan=lifespan)
+
+# Registered before CORS so shed responses still carry CORS headers.
+app.middleware("http")(concurrency_middleware)
 
 # Disable CORS. Do not remove this for full-stack development.
 app.add_middleware(
@@ -29,8 +47,12 @@ app.add_middleware(
 async def healthz():
     return {"status": "ok"}
 
-@app.post("/auth/register")
-async def register(user_data: UserCreate):
+@app.get("/metrics")
+async def metrics(admin_user: dict = Depends(require_admin)):
+    return metrics_snapshot()
+
+@app.post("/auth/register", dependencies=[Depends(rate_limit("register"))])
+def register(user_data: UserCreate):
     existing_user = db.get_user_by_email(user_data.email)
     if existing_user:
         raise HTTPException(
@@ -47,9 +69,11 @@ async def register(user_data: UserCreate):
     return {"message": "User created successfully", "user_id": user["id"]}
 
 @app.post("/auth/login")
-async def login(user_credentials: UserLogin):
+def login(user_credentials: UserLogin, request: Request):
+    enforce_login_attempt(request, user_credentials.email)
     user = authenticate_user(user_credentials.email, user_credentials.password)
     if not user:
+        record_login_failure(request, user_credentials.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -215,7 +239,7 @@ async def get_my_assignment(current_user: dict = Depends(get_current_user)):
     return None
 
 @app.get("/dashboard")
-async def get_dashboard_data(current_user: dict = Depends(get_current_user)):
+async def get_dashboard_data(current_user: dict = Depends(rate_limit_user("dashboard"))):
     vessels = db.get_vessels()
     maintenance_records = db.get_maintenance_records()
     safety_records = db.get_safety_records()
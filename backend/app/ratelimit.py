@@ -0,0 +1,245 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException, Request, status, Depends
+from fastapi.responses import JSONResponse
+from .auth import get_current_user
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+# Budgets per route class as (capacity, refill rate in tokens per second).
+# "login" caps every attempt per client IP; "login_failure" only counts failed
+# passwords per (client IP, account) pair so nobody can lock out someone else.
+ROUTE_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "login": (
+        _env_float("RATE_LIMIT_LOGIN_BURST", 20),
+        _env_float("RATE_LIMIT_LOGIN_PER_SECOND", 20 / 60),
+    ),
+    "login_failure": (
+        _env_float("RATE_LIMIT_LOGIN_FAILURE_BURST", 5),
+        _env_float("RATE_LIMIT_LOGIN_FAILURE_PER_SECOND", 5 / 60),
+    ),
+    "register": (
+        _env_float("RATE_LIMIT_REGISTER_BURST", 3),
+        _env_float("RATE_LIMIT_REGISTER_PER_SECOND", 3 / 300),
+    ),
+    "dashboard": (
+        _env_float("RATE_LIMIT_DASHBOARD_BURST", 10),
+        _env_float("RATE_LIMIT_DASHBOARD_PER_SECOND", 1),
+    ),
+}
+MAX_TRACKED_BUCKETS = _env_int("RATE_LIMIT_MAX_BUCKETS", 10000)
+MAX_CONCURRENT_REQUESTS = _env_int("MAX_CONCURRENT_REQUESTS", 64)
+SHED_EXEMPT_PATHS = {"/healthz", "/metrics"}
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_rate: float, now: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated_at = now
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, now: float, tokens: float = 1.0) -> float:
+        """Seconds until the bucket holds enough tokens; 0 if it already does."""
+        self._refill(now)
+        if self.tokens >= tokens:
+            return 0.0
+        if self.refill_rate <= 0:
+            return math.inf
+        return (tokens - self.tokens) / self.refill_rate
+
+    def consume(self, now: float, tokens: float = 1.0) -> float:
+        wait = self.wait_time(now, tokens)
+        if not wait:
+            self.tokens -= tokens
+        return wait
+
+class RateLimiter:
+    def __init__(self, budgets: Dict[str, Tuple[float, float]], max_buckets: int = MAX_TRACKED_BUCKETS, clock=time.monotonic):
+        for route_class, (capacity, refill_rate) in budgets.items():
+            if capacity < 1 or refill_rate <= 0:
+                raise ValueError(
+                    f"Invalid rate limit for {route_class!r}: burst must be >= 1 and refill rate > 0"
+                )
+        self.budgets = budgets
+        self.max_buckets = max_buckets
+        self._clock = clock
+        self._buckets: "OrderedDict[Tuple[str, str, str], TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed: Dict[str, int] = {route_class: 0 for route_class in budgets}
+        self.rejected: Dict[str, int] = {route_class: 0 for route_class in budgets}
+
+    def _get_bucket(self, key: Tuple[str, str, str], now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity, refill_rate = self.budgets[key[0]]
+            bucket = TokenBucket(capacity, refill_rate, now)
+            self._buckets[key] = bucket
+            # Evict the least recently used buckets so spoofed keys cannot grow memory unbounded.
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _buckets_for(self, route_class: str, identities: Dict[str, Optional[str]], now: float) -> List[TokenBucket]:
+        return [
+            self._get_bucket((route_class, kind, str(value)), now)
+            for kind, value in identities.items()
+            if value is not None
+        ]
+
+    def peek(self, route_class: str, **identities: Optional[str]) -> float:
+        """Like check, but without charging tokens, counting the outcome or tracking new keys."""
+        with self._lock:
+            now = self._clock()
+            buckets = [
+                self._buckets.get((route_class, kind, str(value)))
+                for kind, value in identities.items()
+                if value is not None
+            ]
+            return max((bucket.wait_time(now) for bucket in buckets if bucket is not None), default=0.0)
+
+    def check(self, route_class: str, **identities: Optional[str]) -> float:
+        """Charge one token against every identity for the route class.
+
+        Returns 0 when the request is admitted, otherwise the number of seconds
+        the caller should wait before retrying. A request is only charged when
+        all of its buckets have capacity.
+        """
+        with self._lock:
+            now = self._clock()
+            buckets = self._buckets_for(route_class, identities, now)
+            retry_after = max((bucket.wait_time(now) for bucket in buckets), default=0.0)
+            if retry_after:
+                self.rejected[route_class] += 1
+                return retry_after
+            for bucket in buckets:
+                bucket.consume(now)
+            self.allowed[route_class] += 1
+            return 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            tracked: Dict[str, int] = {route_class: 0 for route_class in self.budgets}
+            for route_class, _, _ in self._buckets:
+                tracked[route_class] += 1
+            return {
+                route_class: {
+                    "capacity": capacity,
+                    "refill_per_second": refill_rate,
+                    "tracked_keys": tracked[route_class],
+                    "allowed": self.allowed[route_class],
+                    "rejected": self.rejected[route_class],
+                }
+                for route_class, (capacity, refill_rate) in self.budgets.items()
+            }
+
+class ConcurrencyLimiter:
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS):
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.max_concurrent:
+            self.shed += 1
+            return False
+        self.in_flight += 1
+        self.admitted += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+limiter = RateLimiter(ROUTE_BUDGETS)
+concurrency_limiter = ConcurrencyLimiter()
+
+def client_ip(request: Request) -> str:
+    # Behind a reverse proxy this is only the real client when uvicorn runs with
+    # --proxy-headers and --forwarded-allow-ips set to the proxy's address.
+    return request.client.host if request.client else "unknown"
+
+def _too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+def _enforce(route_class: str, **identities: Optional[str]):
+    retry_after = limiter.check(route_class, **identities)
+    if retry_after:
+        raise _too_many_requests(retry_after)
+
+def rate_limit(route_class: str):
+    """Dependency limiting an unauthenticated route class per client IP."""
+    def limiter_dependency(request: Request):
+        _enforce(route_class, ip=client_ip(request))
+    return limiter_dependency
+
+def rate_limit_user(route_class: str):
+    """Dependency limiting an authenticated route class per client IP and user."""
+    def limiter_dependency(request: Request, current_user: dict = Depends(get_current_user)) -> dict:
+        _enforce(route_class, ip=client_ip(request), user=current_user["id"])
+        return current_user
+    return limiter_dependency
+
+def _login_identity(request: Request, account: str) -> str:
+    return f"{client_ip(request)}|{account.lower()}"
+
+def enforce_login_attempt(request: Request, account: str):
+    """Admit a login attempt unless its IP or its (IP, account) failures are over budget."""
+    retry_after = limiter.peek("login_failure", account=_login_identity(request, account))
+    if retry_after:
+        raise _too_many_requests(retry_after)
+    _enforce("login", ip=client_ip(request))
+
+def record_login_failure(request: Request, account: str):
+    limiter.check("login_failure", account=_login_identity(request, account))
+
+async def concurrency_middleware(request: Request, call_next):
+    if request.url.path in SHED_EXEMPT_PATHS:
+        return await call_next(request)
+    if not concurrency_limiter.try_acquire():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Server is overloaded, please retry"},
+            headers={"Retry-After": "1"},
+        )
+    try:
+        return await call_next(request)
+    finally:
+        concurrency_limiter.release()
+
+def metrics_snapshot() -> dict:
+    return {
+        "rate_limits": limiter.snapshot(),
+        "concurrency": concurrency_limiter.snapshot(),
+    }
@@ -0,0 +1,93 @@
+"""Write a database snapshot with generated demo data, for use with SEED_SNAPSHOT_PATH.
+
+Usage: python scripts/build_snapshot.py OUTPUT [--users N] [--vessels N] [--records-per-vessel N]
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.auth import get_password_hash
+from app.database import InMemoryDatabase
+from app.models import CrewAssignment, MaintenanceRecord, SafetyRecord, UserRole, Vessel
+
+DEMO_PASSWORD = "password"
+
+def build(users: int, vessels: int, records_per_vessel: int) -> InMemoryDatabase:
+    database = InMemoryDatabase(seed=False)
+    # bcrypt is slow by design, so every generated user shares one hash.
+    hashed_password = get_password_hash(DEMO_PASSWORD)
+    today = date.today()
+
+    user_ids = []
+    for i in range(users):
+        role = UserRole.ADMIN if i == 0 else UserRole.CREW
+        user = database.create_user({
+            "email": f"user{i}@example.com",
+            "first_name": "Demo",
+            "surname": f"User {i}",
+            "role": role.value,
+            "hashed_password": hashed_password,
+        })
+        user_ids.append(user["id"])
+
+    vessel_ids = []
+    for i in range(vessels):
+        vessel = database.create_vessel(Vessel(
+            name=f"MV Demo {i}",
+            imo_number=f"IMO{9000000 + i}",
+            vessel_type="Bulk Carrier",
+            flag_state="Liberia",
+            gross_tonnage=30000.0,
+            year_built=2000 + i % 25,
+            is_active=i % 10 != 0,
+        ).model_dump())
+        vessel_ids.append(vessel["id"])
+
+        for j in range(records_per_vessel):
+            database.create_maintenance_record(MaintenanceRecord(
+                vessel_id=vessel["id"],
+                title=f"Inspection {j}",
+                description="Generated maintenance record",
+                maintenance_type="Routine",
+                scheduled_date=today + timedelta(days=j),
+                status="pending" if j % 2 else "completed",
+                created_by=user_ids[0] if user_ids else 1,
+            ).model_dump())
+            database.create_safety_record(SafetyRecord(
+                vessel_id=vessel["id"],
+                incident_type="Near miss",
+                description="Generated safety record",
+                incident_date=today - timedelta(days=j),
+                severity="low",
+                reported_by=user_ids[0] if user_ids else 1,
+                status="open" if j % 3 == 0 else "closed",
+            ).model_dump())
+
+    if vessel_ids:
+        for i, user_id in enumerate(user_ids[1:]):
+            database.create_crew_assignment(CrewAssignment(
+                user_id=user_id,
+                vessel_id=vessel_ids[i % len(vessel_ids)],
+                position="Deckhand",
+                start_date=today,
+            ).model_dump())
+
+    return database
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--vessels", type=int, default=50)
+    parser.add_argument("--records-per-vessel", type=int, default=20)
+    args = parser.parse_args()
+
+    database = build(args.users, args.vessels, args.records_per_vessel)
+    database.dump_snapshot(args.output)
+    print(f"Wrote snapshot to {args.output} (demo password: {DEMO_PASSWORD!r})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure import-to-first-request time for the API in fresh interpreters.
+
+Usage: python scripts/startup_benchmark.py [--runs N] [--snapshot PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, time
+from fastapi.testclient import TestClient
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    response = client.get("/healthz")
+    first_request = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    "import": imported - start,
+    "startup": ready - imported,
+    "first_request": first_request - start,
+}))
+"""
+
+def run_probe(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--snapshot", help="seed from this snapshot file via SEED_SNAPSHOT_PATH")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.snapshot:
+        env["SEED_SNAPSHOT_PATH"] = str(Path(args.snapshot).resolve())
+
+    samples = [run_probe(env) for _ in range(args.runs)]
+    for phase in ("import", "startup", "first_request"):
+        timings = sorted(sample[phase] * 1000 for sample in samples)
+        print(
+            f"{phase:>13}: median {statistics.median(timings):8.1f} ms  "
+            f"min {timings[0]:8.1f} ms  max {timings[-1]:8.1f} ms"
+        )
+
+if __name__ == "__main__":
+    main()
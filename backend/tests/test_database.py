@@ -0,0 +1,85 @@
+import subprocess
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database
+from app.database import InMemoryDatabase, init_db
+from app.main import app
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def fresh_db(monkeypatch):
+    monkeypatch.setattr(database, "_db", None)
+    monkeypatch.setattr(database, "_db_snapshot_path", None)
+    monkeypatch.delenv("SEED_SNAPSHOT_PATH", raising=False)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    source = InMemoryDatabase(seed=False)
+    source.create_vessel({"name": "MV Snapshot", "vessel_type": "Tanker", "flag_state": "Malta", "is_active": True})
+    source.create_crew_assignment({
+        "user_id": 7,
+        "vessel_id": 1,
+        "position": "Bosun",
+        "start_date": date(2025, 3, 1),
+        "end_date": None,
+        "is_active": True,
+    })
+    path = tmp_path / "snapshot.json"
+    source.dump_snapshot(str(path))
+    return path
+
+
+def test_snapshot_round_trip_preserves_types_and_next_id(tmp_path):
+    source = InMemoryDatabase()
+    source.create_crew_assignment({"user_id": 1, "vessel_id": 1, "position": "Cook", "start_date": date(2025, 1, 2), "is_active": True})
+    path = tmp_path / "snapshot.json"
+    source.dump_snapshot(str(path))
+
+    loaded = InMemoryDatabase(seed=False)
+    loaded.load_snapshot(str(path))
+
+    for table in database.TABLES:
+        assert getattr(loaded, table) == getattr(source, table)
+    assert all(isinstance(key, int) for key in loaded.vessels)
+    vessel = next(iter(loaded.vessels.values()))
+    assert isinstance(vessel["created_at"], datetime)
+    maintenance = next(iter(loaded.maintenance_records.values()))
+    assert type(maintenance["scheduled_date"]) is date
+    assert loaded._next_id == source._next_id
+    assert loaded.create_vessel({"name": "New"})["id"] == source._next_id
+
+
+def test_importing_main_does_not_build_database():
+    code = "import app.main, app.database as d; assert d._db is None"
+    subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, check=True)
+
+
+def test_startup_builds_seeded_database(fresh_db):
+    with TestClient(app) as client:
+        assert database._db is not None
+        assert client.get("/healthz").status_code == 200
+    assert database._db.get_vessel_by_id(1)["name"] == "MV Ocean Explorer"
+
+
+def test_seed_snapshot_path_replaces_demo_seed(fresh_db, snapshot_path, monkeypatch):
+    monkeypatch.setenv("SEED_SNAPSHOT_PATH", str(snapshot_path))
+    with TestClient(app):
+        vessels = database.db.get_vessels()
+    assert [vessel["name"] for vessel in vessels] == ["MV Snapshot"]
+    assert database.db.get_maintenance_records() == []
+
+
+def test_init_db_rejects_different_snapshot_after_init(fresh_db, snapshot_path, tmp_path):
+    first = init_db(str(snapshot_path))
+    assert init_db() is first
+    assert init_db(str(snapshot_path)) is first
+    with pytest.raises(RuntimeError):
+        init_db(str(tmp_path / "other.json"))
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from app import database, ratelimit
+from app.auth import get_password_hash, verify_password
+from app.main import app
+from app.ratelimit import ConcurrencyLimiter, RateLimiter, ROUTE_BUDGETS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def p99(samples):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "limiter", RateLimiter(ROUTE_BUDGETS, clock=clock))
+    monkeypatch.setattr(ratelimit, "concurrency_limiter", ConcurrencyLimiter())
+    return clock
+
+
+@pytest.fixture
+def client(clock):
+    with TestClient(app) as client:
+        yield client
+
+
+def bcrypt_cost(hashed_password):
+    start = time.perf_counter()
+    verify_password("wrong", hashed_password)
+    return time.perf_counter() - start
+
+
+def register_and_login(client, email, role="crew"):
+    response = client.post("/auth/register", json={"email": email, "password": "secret", "role": role})
+    assert response.status_code == 200
+    response = client.post("/auth/login", json={"email": email, "password": "secret"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_token_bucket_refill_restores_admission():
+    clock = FakeClock()
+    limiter = RateLimiter({"x": (2, 1)}, clock=clock)
+    assert limiter.check("x", ip="a") == 0
+    assert limiter.check("x", ip="a") == 0
+    assert limiter.check("x", ip="a") == pytest.approx(1.0)
+    assert limiter.check("x", ip="b") == 0
+    clock.now += 1
+    assert limiter.check("x", ip="a") == 0
+    snapshot = limiter.snapshot()["x"]
+    assert (snapshot["allowed"], snapshot["rejected"], snapshot["tracked_keys"]) == (4, 1, 2)
+
+
+def test_rate_limiter_rejects_non_positive_refill():
+    with pytest.raises(ValueError):
+        RateLimiter({"x": (1, 0)})
+
+
+def test_rate_limiter_evicts_least_recently_used_buckets():
+    limiter = RateLimiter({"x": (1, 1)}, max_buckets=2, clock=FakeClock())
+    for ip in ("a", "b", "c"):
+        limiter.check("x", ip=ip)
+    assert limiter.snapshot()["x"]["tracked_keys"] == 2
+    assert limiter.check("x", ip="a") == 0
+
+
+def test_sixth_failed_login_is_rejected_until_refill(client, clock):
+    credentials = {"email": "victim@example.com", "password": "wrong"}
+    for _ in range(5):
+        assert client.post("/auth/login", json=credentials).status_code == 401
+    response = client.post("/auth/login", json=credentials)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    clock.now += 60 / 5
+    assert client.post("/auth/login", json=credentials).status_code == 401
+
+
+def test_successful_logins_do_not_spend_failure_budget(client):
+    register_and_login(client, "sailor@example.com")
+    for _ in range(6):
+        response = client.post("/auth/login", json={"email": "sailor@example.com", "password": "secret"})
+        assert response.status_code == 200
+    assert ratelimit.limiter.snapshot()["login_failure"]["tracked_keys"] == 0
+
+
+def test_register_is_limited_per_ip(client):
+    for i in range(3):
+        response = client.post("/auth/register", json={"email": f"user{i}@example.com", "password": "secret"})
+        assert response.status_code == 200
+    response = client.post("/auth/register", json={"email": "user3@example.com", "password": "secret"})
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+def test_dashboard_is_limited_per_user(client):
+    headers = register_and_login(client, "poller@example.com")
+    statuses = [client.get("/dashboard", headers=headers).status_code for _ in range(11)]
+    assert statuses == [200] * 10 + [429]
+
+
+def test_requests_past_concurrency_cap_are_shed(client, monkeypatch):
+    headers = register_and_login(client, "admin@example.com", role="admin")
+    monkeypatch.setattr(ratelimit.concurrency_limiter, "max_concurrent", 0)
+
+    response = client.get("/vessels", headers=headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/healthz").status_code == 200
+
+    metrics = client.get("/metrics", headers=headers)
+    assert metrics.status_code == 200
+    assert metrics.json()["concurrency"]["shed"] == 1
+
+
+def test_metrics_requires_admin(client):
+    assert client.get("/metrics").status_code in (401, 403)
+    headers = register_and_login(client, "crew@example.com")
+    assert client.get("/metrics", headers=headers).status_code == 403
+
+
+def test_wrong_password_burst_p99_latency_is_bounded(client, monkeypatch):
+    # Cap concurrency low enough that a single core keeps admitted bcrypt work short.
+    monkeypatch.setattr(ratelimit.concurrency_limiter, "max_concurrent", 4)
+    hashed_password = get_password_hash("secret")
+    emails = [f"burst{i}@example.com" for i in range(20)]
+    for email in emails:
+        database.db.create_user({"email": email, "role": "crew", "hashed_password": hashed_password})
+
+    def attempt(i):
+        start = time.perf_counter()
+        response = client.post("/auth/login", json={"email": emails[i % len(emails)], "password": "wrong"})
+        return response.status_code, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(attempt, range(200)))
+
+    statuses = [status for status, _ in results]
+    assert 0 < statuses.count(401) <= ROUTE_BUDGETS["login"][0]
+    assert set(statuses) <= {401, 429, 503}
+    # Admitted requests run bcrypt, at most max_concurrent at a time; rejected and
+    # shed requests must not queue behind them.
+    bcrypt_seconds = bcrypt_cost(hashed_password)
+    rejected = [latency for status, latency in results if status != 401]
+    assert p99(rejected) < bcrypt_seconds
+    assert p99([latency for _, latency in results]) < bcrypt_seconds * 6
+
+
+def test_shedding_bounds_p99_latency_under_overload(monkeypatch):
+    monkeypatch.setattr(ratelimit, "concurrency_limiter", ConcurrencyLimiter(max_concurrent=8))
+    work_seconds = 0.05
+
+    async def slow_handler(request):
+        await asyncio.sleep(work_seconds)
+        return PlainTextResponse("ok")
+
+    async def one_request():
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/vessels",
+            "headers": [],
+            "query_string": b"",
+            "scheme": "http",
+            "server": ("test", 80),
+        }
+        start = time.perf_counter()
+        response = await ratelimit.concurrency_middleware(Request(scope), slow_handler)
+        return response.status_code, time.perf_counter() - start
+
+    async def burst():
+        return await asyncio.gather(*(one_request() for _ in range(200)))
+
+    results = asyncio.run(burst())
+    statuses = [status for status, _ in results]
+    assert statuses.count(200) == 8
+    assert statuses.count(503) == 192
+    assert ratelimit.concurrency_limiter.in_flight == 0
+    # Without shedding, queued work would push the tail far past a single unit of work.
+    assert p99([latency for _, latency in results]) < work_seconds * 4